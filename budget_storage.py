@@ -0,0 +1,721 @@
+import math
+import sqlite3
+from abc import ABC, abstractmethod
+from array import array
+from datetime import datetime, timezone
+
+# Rows removed or reassigned per transaction when deleting/merging categories.
+BATCH_SIZE = 5000
+
+# Category table and transaction table for each kind of category.
+CATEGORY_TABLES = {
+    'expense': ('expense_categories', 'expenses'),
+    'income': ('income_categories', 'income'),
+}
+
+DEFAULT_CATEGORIES = {
+    'expense': ['Food', 'Transport', 'Utilities', 'Entertainment', 'Health'],
+    'income': ['Salary', 'Freelance', 'Investment', 'Bonus', 'Other'],
+}
+
+
+def category_tables(kind):
+    """
+    Returns the (category table, record table) of a kind of category.
+    Raises ValueError for anything but 'expense' or 'income'.
+    """
+    try:
+        return CATEGORY_TABLES[kind]
+    except KeyError:
+        raise ValueError(f"Unknown category kind '{kind}'")
+
+
+class DuplicateCategoryError(Exception):
+    """
+    Raised when a category is added that already exists.
+    """
+
+
+class Storage(ABC):
+    """
+    The interface every storage backend of Budgets Are Us provides.
+
+    - kind is always 'expense' or 'income'.
+    - Methods raise ValueError when the kind or a category doesn't
+      exist, and then change nothing.
+    - Records are returned as plain tuples so the menu functions
+      don't care which backend they talk to.
+    - progress, where accepted, is called as
+      progress(done, total, table, verb) while records are deleted or
+      moved, e.g. progress(5000, 12000, 'expenses', 'deleted').
+    """
+
+    @abstractmethod
+    def categories(self, kind):
+        """Returns the names of all categories of the given kind."""
+
+    @abstractmethod
+    def add_category(self, kind, name):
+        """Adds a category, raising DuplicateCategoryError if it exists."""
+
+    @abstractmethod
+    def add_record(self, kind, category, amount, date=None):
+        """
+        Adds an expense or income record (date defaults to today).
+        Raises ValueError if the category doesn't exist.
+        """
+
+    @abstractmethod
+    def add_records(self, kind, rows):
+        """
+        Adds many (category, amount, date) records at once. If any
+        category doesn't exist, ValueError is raised and nothing is added.
+        """
+
+    @abstractmethod
+    def last_expense(self):
+        """Returns (id, category, amount) of the latest expense, or None."""
+
+    @abstractmethod
+    def update_expense(self, expense_id, amount):
+        """Changes the amount of an expense."""
+
+    @abstractmethod
+    def records(self, kind):
+        """Returns (date, category, amount) rows, newest first."""
+
+    @abstractmethod
+    def records_by_category(self, kind):
+        """Returns (category, date, amount) rows by category, newest first."""
+
+    @abstractmethod
+    def set_budget(self, category, amount):
+        """
+        Sets (or replaces) the budget of an expense category.
+        Raises ValueError if the category doesn't exist.
+        """
+
+    @abstractmethod
+    def budget_overview(self):
+        """Returns (category, budget_amount, total_spent) per budget."""
+
+    @abstractmethod
+    def set_goal(self, description, target):
+        """Replaces the single financial goal."""
+
+    @abstractmethod
+    def goal(self):
+        """Returns (description, target_amount) of the goal, or None."""
+
+    @abstractmethod
+    def total(self, kind):
+        """
+        Returns the sum of all expense or income amounts. Backends may
+        differ in the last digits of a float sum.
+        """
+
+    @abstractmethod
+    def delete_category(self, kind, category, progress=None,
+                        batch_size=BATCH_SIZE):
+        """
+        Deletes a category with its records; returns records deleted.
+        Raises ValueError if the category doesn't exist.
+        """
+
+    @abstractmethod
+    def merge_category(self, kind, source, target, progress=None,
+                       batch_size=BATCH_SIZE):
+        """
+        Moves records of source into target; returns records moved.
+        Raises ValueError if either category doesn't exist or if source
+        and target are the same category.
+        """
+
+    def close(self):
+        """Saves and releases the backend."""
+
+
+def today():
+    """
+    Returns today's date the way SQLite's CURRENT_DATE does (UTC).
+    """
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+class SQLiteStorage(Storage):
+    """
+    Stores everything in a SQLite database file.
+
+    - Connects to the database (creates it if it doesn't exist).
+    - Enables foreign key constraints so linked data works properly.
+    - Creates all the tables we need for the app.
+    """
+
+    def __init__(self, path='budgets_are_us.db'):
+        self.connect = sqlite3.connect(path)
+        self.budgets = self.connect.cursor()
+        self.budgets.execute("PRAGMA foreign_keys = ON")
+        self.create_tables()
+
+    def create_tables(self):
+        """
+        This method sets up all the necessary tables in the database
+        if they don’t already exist.
+
+        It creates the following tables:
+        - expense_categories: list of unique categories for expenses
+        - income_categories: list of unique categories for income
+        - expenses: to store expense transactions
+        - income: to store income transactions
+        - budget: stores budget amounts for each expense category
+        - financial_goals: lets users track their savings or financial targets
+
+        It also indexes the category column of expenses and income.
+        """
+        budgets = self.budgets
+
+        budgets.execute('''
+            CREATE TABLE IF NOT EXISTS expense_categories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL
+            )
+        ''')
+
+
+        budgets.execute('''
+            CREATE TABLE IF NOT EXISTS income_categories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL
+            )
+        ''')
+
+
+        budgets.execute('''
+            CREATE TABLE IF NOT EXISTS expenses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                category TEXT NOT NULL,
+                amount REAL NOT NULL,
+                date TEXT DEFAULT CURRENT_DATE,
+                note TEXT,
+                FOREIGN KEY (category) REFERENCES expense_categories(name)
+            )
+        ''')
+
+
+        budgets.execute('''
+            CREATE TABLE IF NOT EXISTS income (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                category TEXT NOT NULL,
+                amount REAL NOT NULL,
+                date TEXT DEFAULT CURRENT_DATE,
+                note TEXT,
+                FOREIGN KEY (category) REFERENCES income_categories(name)
+            )
+        ''')
+
+
+        budgets.execute('''
+            CREATE TABLE IF NOT EXISTS budget (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                category TEXT NOT NULL UNIQUE,
+                budget_amount REAL NOT NULL,
+                FOREIGN KEY (category) REFERENCES expense_categories(name)
+            )
+        ''')
+
+
+        # Indexes so category lookups, deletes and merges don't scan every row
+        budgets.execute(
+            "CREATE INDEX IF NOT EXISTS idx_expenses_category "
+            "ON expenses (category)"
+        )
+        budgets.execute(
+            "CREATE INDEX IF NOT EXISTS idx_income_category "
+            "ON income (category)"
+        )
+
+
+        budgets.execute('''
+            CREATE TABLE IF NOT EXISTS financial_goals (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                description TEXT NOT NULL,
+                target_amount REAL NOT NULL,
+                current_progress REAL DEFAULT 0.0
+            )
+        ''')
+
+
+        # Default Data for Expenses and Income
+        for kind, names in DEFAULT_CATEGORIES.items():
+            budgets.executemany(
+                f"INSERT OR IGNORE INTO {category_tables(kind)[0]} (name) "
+                "VALUES (?)", [(name,) for name in names]
+            )
+        self.connect.commit()
+
+    def categories(self, kind):
+        self.budgets.execute(f"SELECT name FROM {category_tables(kind)[0]}")
+        return [row[0] for row in self.budgets.fetchall()]
+
+    def add_category(self, kind, name):
+        try:
+            self.budgets.execute(
+                f"INSERT INTO {category_tables(kind)[0]} (name) "
+                "VALUES (?)", (name,)
+            )
+        except sqlite3.IntegrityError:
+            raise DuplicateCategoryError(name)
+        self.connect.commit()
+
+    def add_record(self, kind, category, amount, date=None):
+        self.add_records(kind, [(category, amount, date or today())])
+
+    def add_records(self, kind, rows):
+        try:
+            self.budgets.executemany(
+                f"INSERT INTO {category_tables(kind)[1]} (category, amount, "
+                "date) VALUES (?, ?, ?)",
+                [(category, amount, date or today())
+                 for category, amount, date in rows]
+            )
+        except sqlite3.IntegrityError:
+            self.connect.rollback()
+            raise ValueError(f"Unknown {kind} category in records")
+        self.connect.commit()
+
+    def last_expense(self):
+        self.budgets.execute("SELECT id, category, amount FROM expenses " \
+                             "ORDER BY date DESC, id DESC LIMIT 1")
+        return self.budgets.fetchone()
+
+    def update_expense(self, expense_id, amount):
+        self.budgets.execute("UPDATE expenses SET amount = ? "
+                             "WHERE id = ?", (amount, expense_id))
+        self.connect.commit()
+
+    def records(self, kind):
+        self.budgets.execute(f"SELECT date, category, amount FROM "
+                             f"{category_tables(kind)[1]} "
+                             "ORDER BY date DESC, id")
+        return self.budgets.fetchall()
+
+    def records_by_category(self, kind):
+        self.budgets.execute(f"SELECT category, date, amount FROM "
+                             f"{category_tables(kind)[1]} "
+                             "ORDER BY category, date DESC, id")
+        return self.budgets.fetchall()
+
+    def set_budget(self, category, amount):
+        try:
+            self.budgets.execute(
+                "INSERT INTO budget (category, budget_amount) VALUES (?, ?) "
+                "ON CONFLICT(category) DO UPDATE SET budget_amount = " \
+                "excluded.budget_amount",
+                (category, amount)
+            )
+        except sqlite3.IntegrityError:
+            self.connect.rollback()
+            raise ValueError(f"Unknown expense category '{category}'")
+        self.connect.commit()
+
+    def budget_overview(self):
+        self.budgets.execute('''
+            SELECT b.category, b.budget_amount,
+                   IFNULL(SUM(e.amount), 0) AS total_spent
+            FROM budget b
+            LEFT JOIN expenses e ON b.category = e.category
+            GROUP BY b.category, b.budget_amount
+            ORDER BY b.category
+        ''')
+        return self.budgets.fetchall()
+
+    def set_goal(self, description, target):
+        self.budgets.execute("DELETE FROM financial_goals")
+        self.budgets.execute('''
+            INSERT INTO financial_goals (description, target_amount, current_progress)
+            VALUES (?, ?, 0)
+        ''', (description, target))
+        self.connect.commit()
+
+    def goal(self):
+        self.budgets.execute("SELECT description, target_amount "
+                             "FROM financial_goals")
+        return self.budgets.fetchone()
+
+    def total(self, kind):
+        self.budgets.execute(f"SELECT IFNULL(SUM(amount), 0) FROM "
+                             f"{category_tables(kind)[1]}")
+        return self.budgets.fetchone()[0]
+
+    def check_category(self, kind, category):
+        """
+        Raises ValueError unless category is a category of the given kind.
+        """
+        self.budgets.execute(f"SELECT 1 FROM {category_tables(kind)[0]} "
+                             "WHERE name = ?", (category,))
+        if self.budgets.fetchone() is None:
+            raise ValueError(f"Unknown {kind} category '{category}'")
+
+    def run_in_batches(self, table, statement, params, progress, verb,
+                       batch_size):
+        """
+        Runs a DELETE or UPDATE on the records of one category in small
+        batches, committing after each one so the database is never
+        locked for long. The statement picks its rows with the last two
+        parameters: the category name and the batch size.
+        Returns the number of rows changed.
+        """
+        category = params[-1]
+        self.budgets.execute(f"SELECT COUNT(*) FROM {table} "
+                             "WHERE category = ?", (category,))
+        total = self.budgets.fetchone()[0]
+
+        done = 0
+        while done < total:
+            try:
+                self.budgets.execute(statement, params + (batch_size,))
+            except sqlite3.Error:
+                self.connect.rollback()
+                raise
+            changed = self.budgets.rowcount
+            self.connect.commit()
+            if changed <= 0:
+                break
+            done += changed
+            if progress:
+                progress(min(done, total), total, table, verb)
+
+        return done
+
+    def delete_category(self, kind, category, progress=None,
+                        batch_size=BATCH_SIZE):
+        """
+        Deletes an expense or income category along with its records.
+
+        The records are removed first in indexed batches, then the budget
+        (for expense categories) and finally the category itself, so the
+        foreign keys are never broken. The foreign keys deliberately have
+        no ON DELETE CASCADE: a cascade would delete every record in one
+        long write, which is what the batches avoid.
+        Raises ValueError if the category doesn't exist.
+        """
+        self.check_category(kind, category)
+        category_table, record_table = category_tables(kind)
+
+        removed = self.run_in_batches(
+            record_table,
+            f"DELETE FROM {record_table} WHERE id IN "
+            f"(SELECT id FROM {record_table} WHERE category = ? LIMIT ?)",
+            (category,), progress, 'deleted', batch_size
+        )
+
+        try:
+            if kind == 'expense':
+                self.budgets.execute("DELETE FROM budget WHERE category = ?",
+                                     (category,))
+            self.budgets.execute(f"DELETE FROM {category_table} "
+                                 "WHERE name = ?", (category,))
+        except sqlite3.Error:
+            self.connect.rollback()
+            raise
+        self.connect.commit()
+
+        return removed
+
+    def merge_category(self, kind, source, target, progress=None,
+                       batch_size=BATCH_SIZE):
+        """
+        Merges one expense or income category into another.
+
+        The records of source are reassigned to target in indexed batches.
+        For expense categories the budget of source is added to the budget
+        of target, since target now carries the spending of both. Finally
+        source is deleted. Raises ValueError if either category doesn't
+        exist or if source and target are the same category.
+        """
+        if source == target:
+            raise ValueError(f"Cannot merge '{source}' into itself")
+        self.check_category(kind, source)
+        self.check_category(kind, target)
+        category_table, record_table = category_tables(kind)
+
+        moved = self.run_in_batches(
+            record_table,
+            f"UPDATE {record_table} SET category = ? WHERE id IN "
+            f"(SELECT id FROM {record_table} WHERE category = ? LIMIT ?)",
+            (target, source), progress, 'moved', batch_size
+        )
+
+        try:
+            if kind == 'expense':
+                self.budgets.execute("SELECT budget_amount FROM budget "
+                                     "WHERE category = ?", (source,))
+                row = self.budgets.fetchone()
+                if row:
+                    self.budgets.execute("DELETE FROM budget "
+                                         "WHERE category = ?", (source,))
+                    self.budgets.execute(
+                        "INSERT INTO budget (category, budget_amount) "
+                        "VALUES (?, ?) ON CONFLICT(category) DO UPDATE SET "
+                        "budget_amount = budget_amount + "
+                        "excluded.budget_amount",
+                        (target, row[0])
+                    )
+            self.budgets.execute(f"DELETE FROM {category_table} "
+                                 "WHERE name = ?", (source,))
+        except sqlite3.Error:
+            self.connect.rollback()
+            raise
+        self.connect.commit()
+
+        return moved
+
+    def close(self):
+        self.connect.commit()
+        self.connect.close()
+
+
+class MemoryRecords:
+    """
+    Column arrays holding the expense or income records of MemoryStorage.
+
+    Every record is one position across the columns. Categories are
+    stored as a small integer code into MemoryStorage's category list,
+    amounts as C doubles, and a running total per category is kept so
+    budgets and goals never have to walk the records. Appends add to the
+    total; updates and merges recount it exactly from the amounts so
+    rounding error doesn't build up.
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.codes = array('l')
+        self.amounts = array('d')
+        self.dates = []
+        self.spent = {}
+        self.next_id = 1
+
+    def append(self, code, amount, date):
+        self.ids.append(self.next_id)
+        self.next_id += 1
+        self.codes.append(code)
+        self.amounts.append(amount)
+        self.dates.append(date)
+        self.spent[code] = self.spent.get(code, 0.0) + amount
+
+    def recount(self, code):
+        """Recomputes the total of one category from its amounts."""
+        self.spent[code] = math.fsum(
+            amount for c, amount in zip(self.codes, self.amounts)
+            if c == code
+        )
+
+    def keep(self, wanted):
+        """Keeps only the record positions for which wanted(code) is true."""
+        keep = [i for i, code in enumerate(self.codes) if wanted(code)]
+        self.ids = array('q', (self.ids[i] for i in keep))
+        self.codes = array('l', (self.codes[i] for i in keep))
+        self.amounts = array('d', (self.amounts[i] for i in keep))
+        self.dates = [self.dates[i] for i in keep]
+
+
+class MemoryStorage(Storage):
+    """
+    Keeps everything in memory, for tests and what-if simulations.
+
+    Nothing is written to disk, so thousands of simulated months of
+    income, spending and budgets can be recorded and read back at
+    memory speed. It behaves like SQLiteStorage, starting with the same
+    default categories.
+    """
+
+    def __init__(self):
+        self.names = {'expense': [], 'income': []}
+        self.codes = {'expense': {}, 'income': {}}
+        self.data = {'expense': MemoryRecords(), 'income': MemoryRecords()}
+        self.budgets = {}
+        self.current_goal = None
+        for kind, names in DEFAULT_CATEGORIES.items():
+            for name in names:
+                self.add_category(kind, name)
+
+    def code(self, kind, category):
+        """Returns the code of a category, like a foreign key check."""
+        try:
+            return self.codes[kind][category]
+        except KeyError:
+            category_tables(kind)
+            raise ValueError(f"Unknown {kind} category '{category}'")
+
+    def categories(self, kind):
+        category_tables(kind)
+        return [name for name in self.names[kind] if name is not None]
+
+    def add_category(self, kind, name):
+        category_tables(kind)
+        if name in self.codes[kind]:
+            raise DuplicateCategoryError(name)
+        self.codes[kind][name] = len(self.names[kind])
+        self.names[kind].append(name)
+
+    def add_record(self, kind, category, amount, date=None):
+        self.data[kind].append(self.code(kind, category), amount,
+                               date or today())
+
+    def add_records(self, kind, rows):
+        # Look every category up first so a bad row adds nothing
+        coded = [(self.code(kind, category), amount, date or today())
+                 for category, amount, date in rows]
+        for code, amount, date in coded:
+            self.data[kind].append(code, amount, date)
+
+    def last_expense(self):
+        data = self.data['expense']
+        if not data.ids:
+            return None
+        i = max(range(len(data.ids)),
+                key=lambda i: (data.dates[i], data.ids[i]))
+        return (data.ids[i], self.names['expense'][data.codes[i]],
+                data.amounts[i])
+
+    def update_expense(self, expense_id, amount):
+        data = self.data['expense']
+        for i, record_id in enumerate(data.ids):
+            if record_id == expense_id:
+                data.amounts[i] = amount
+                data.recount(data.codes[i])
+                return
+
+    def rows(self, kind):
+        """Returns (date, category, amount) rows in insertion order."""
+        category_tables(kind)
+        data, names = self.data[kind], self.names[kind]
+        return [(date, names[code], amount) for date, code, amount
+                in zip(data.dates, data.codes, data.amounts)]
+
+    def records(self, kind):
+        rows = self.rows(kind)
+        rows.sort(key=lambda row: row[0], reverse=True)
+        return rows
+
+    def records_by_category(self, kind):
+        rows = [(category, date, amount)
+                for date, category, amount in self.rows(kind)]
+        rows.sort(key=lambda row: row[1], reverse=True)
+        rows.sort(key=lambda row: row[0])
+        return rows
+
+    def set_budget(self, category, amount):
+        self.code('expense', category)
+        self.budgets[category] = float(amount)
+
+    def budget_overview(self):
+        spent = self.data['expense'].spent
+        return [(category, amount,
+                 spent.get(self.codes['expense'][category], 0.0))
+                for category, amount in sorted(self.budgets.items())]
+
+    def set_goal(self, description, target):
+        self.current_goal = (description, float(target))
+
+    def goal(self):
+        return self.current_goal
+
+    def total(self, kind):
+        category_tables(kind)
+        return math.fsum(self.data[kind].spent.values())
+
+    def drop_category(self, kind, category):
+        """Forgets a category name, keeping the codes of the others."""
+        code = self.codes[kind].pop(category)
+        self.names[kind][code] = None
+        self.data[kind].spent.pop(code, None)
+        if kind == 'expense':
+            self.budgets.pop(category, None)
+        return code
+
+    def delete_category(self, kind, category, progress=None,
+                        batch_size=BATCH_SIZE):
+        code = self.code(kind, category)
+        data = self.data[kind]
+        before = len(data.ids)
+        data.keep(lambda c: c != code)
+        removed = before - len(data.ids)
+        if progress and removed:
+            progress(removed, removed, category_tables(kind)[1], 'deleted')
+        self.drop_category(kind, category)
+        return removed
+
+    def merge_category(self, kind, source, target, progress=None,
+                       batch_size=BATCH_SIZE):
+        if source == target:
+            raise ValueError(f"Cannot merge '{source}' into itself")
+        source_code = self.code(kind, source)
+        target_code = self.code(kind, target)
+        data = self.data[kind]
+        moved = 0
+        for i, code in enumerate(data.codes):
+            if code == source_code:
+                data.codes[i] = target_code
+                moved += 1
+        data.recount(target_code)
+        if progress and moved:
+            progress(moved, moved, category_tables(kind)[1], 'moved')
+
+        if kind == 'expense' and source in self.budgets:
+            self.budgets[target] = (self.budgets.get(target, 0.0)
+                                    + self.budgets[source])
+        self.drop_category(kind, source)
+        return moved
+
+
+def simulate_months(store, months, income, spending, budgets=None,
+                    start='2025-01'):
+    """
+    Runs a what-if simulation of the given number of months on a store.
+    Best used with a MemoryStorage, as the records are really added.
+
+    - income and spending map a category to the amount received or
+      spent every month.
+    - budgets, if given, maps expense categories to a monthly budget
+      and is set on the store before the first month.
+    - Each month's records are added on the first day of that month,
+      starting from the start month ('YYYY-MM').
+
+    Returns one (month, net_savings, over_budget) tuple per month, read
+    back from the store after that month was added: net_savings is
+    Total Income - Total Expenses (including any earlier records) and
+    over_budget lists the categories that spent more than their budget
+    during that month.
+    """
+    year, month = (int(part) for part in start.split('-'))
+    for category, amount in (budgets or {}).items():
+        store.set_budget(category, amount)
+
+    results = []
+    spent_before = {category: spent for category, _, spent
+                    in store.budget_overview()}
+    for _ in range(months):
+        label = f"{year:04d}-{month:02d}"
+        date = label + '-01'
+        store.add_records('income', [(category, amount, date)
+                                     for category, amount in income.items()])
+        store.add_records('expense', [(category, amount, date)
+                                      for category, amount
+                                      in spending.items()])
+
+        overview = store.budget_overview()
+        over_budget = [
+            category for category, budget_amount, spent in overview
+            if round(spent - spent_before.get(category, 0.0), 2)
+            > budget_amount
+        ]
+        spent_before = {category: spent for category, _, spent in overview}
+        savings = store.total('income') - store.total('expense')
+        results.append((label, savings, over_budget))
+
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+
+    return results
@@ -1,23 +1,20 @@
-
-import sqlite3  # Importing SQLite3
 from colorama import Fore, init
+from budget_storage import DuplicateCategoryError, SQLiteStorage
 init(autoreset=True)
 
 
-def letsbudget():
+def letsbudget(store=None):
     """
     This is the main function that starts the Budgets Are Us program.
 
     It does the following:
-    - Connects to the SQLite database (creates it if it doesn't exist).
-    - Enables foreign key constraints so linked data works properly.
-    - Creates all the tables we need for the app.
+    - Opens the SQLite storage (see budget_storage.SQLiteStorage), which
+      creates the database and its tables if they don't exist, unless
+      another store such as budget_storage.MemoryStorage is passed in.
     - Displays the menu and runs in a loop until the user chooses to quit.
     """
-    connect = sqlite3.connect('budgets_are_us.db')
-    budgets = connect.cursor()
-    budgets.execute("PRAGMA foreign_keys = ON")
-    create_tables(budgets)
+    if store is None:
+        store = SQLiteStorage('budgets_are_us.db')
 
 
     while True:
@@ -37,34 +34,34 @@ def letsbudget():
 : ''').strip()
 
         if menu == '1':
-            add_expense(budgets, connect)
+            add_expense(store)
 
         elif menu == '2':
-            view_expenses(budgets)
+            view_expenses(store)
 
         elif menu == '3':
-            view_by_category(budgets)
+            view_by_category(store)
 
         elif menu == '4':
-            add_income(budgets, connect)
+            add_income(store)
 
         elif menu == '5':
-            view_income(budgets)
+            view_income(store)
 
         elif menu == '6':
-            view_income_category(budgets)
+            view_income_category(store)
 
         elif menu == '7':
-            set_budget(budgets, connect)
+            set_budget(store)
 
         elif menu == '8':
-            view_budget(budgets)
+            view_budget(store)
 
         elif menu == '9':
-            set_financial_goal(budgets, connect)
+            set_financial_goal(store)
 
         elif menu == '10':
-            view_financial_goals(budgets, connect)
+            view_financial_goals(store)
 
         elif menu == '11':
             print(Fore.CYAN + 'Goodbye from Budgets Are Us! 💸')
@@ -74,119 +71,25 @@ def letsbudget():
             print("You have entered an invalid number. Please try again")
 
 
-    connect.commit()
-    connect.close()
-
-def create_tables(budgets):
-    """
-    This function sets up all the necessary tables in the database 
-    if they don’t already exist.
-
-    It creates the following tables:
-    - expense_categories: list of unique categories for expenses
-    - income_categories: list of unique categories for income
-    - expenses: to store expense transactions
-    - income: to store income transactions
-    - budget: stores budget amounts for each expense category
-    - financial_goals: lets users track their savings or financial targets
-
-    It uses the cursor passed from the main function to run the SQL commands.
-    """
-
-    budgets.execute('''
-        CREATE TABLE IF NOT EXISTS expense_categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL
-        )
-    ''')
-
-
-    budgets.execute('''
-        CREATE TABLE IF NOT EXISTS income_categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL
-        )
-    ''')
-
-
-    budgets.execute('''
-        CREATE TABLE IF NOT EXISTS expenses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            category TEXT NOT NULL,
-            amount REAL NOT NULL,
-            date TEXT DEFAULT CURRENT_DATE,
-            note TEXT,
-            FOREIGN KEY (category) REFERENCES expense_categories(name)
-        )
-    ''')
-
-
-    budgets.execute('''
-        CREATE TABLE IF NOT EXISTS income (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            category TEXT NOT NULL,
-            amount REAL NOT NULL,
-            date TEXT DEFAULT CURRENT_DATE,
-            note TEXT,
-            FOREIGN KEY (category) REFERENCES income_categories(name)
-        )
-    ''')
-
-
-    budgets.execute('''
-        CREATE TABLE IF NOT EXISTS budget (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            category TEXT NOT NULL UNIQUE,
-            budget_amount REAL NOT NULL,
-            FOREIGN KEY (category) REFERENCES expense_categories(name)
-        )
-    ''')
-
-
-
-    budgets.execute('''
-        CREATE TABLE IF NOT EXISTS financial_goals (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            description TEXT NOT NULL,
-            target_amount REAL NOT NULL,
-            current_progress REAL DEFAULT 0.0
-        )
-    ''')
-
-
-# Default Data for Expenses
-    budgets.execute("""
-        INSERT OR IGNORE INTO expense_categories (name) 
-        VALUES ('Food'), ('Transport'), ('Utilities'), 
-        ('Entertainment'), ('Health')
-        """)
-
-    #  Default Data for Income
-    budgets.execute("""
-        INSERT OR IGNORE INTO income_categories (name) 
-        VALUES ('Salary'), ('Freelance'), ('Investment'), 
-        ('Bonus'), ('Other')
-    """)
-
+    store.close()
 
 #  Menu Option 1 – Add Expense
-def add_expense(budgets, connect):
+def add_expense(store):
     """
     - Allows the user to add or manage expenses.
     - Users can:
       * View and select existing categories
       * Add a new category
-      * Delete a category
+      * Delete a category, or merge it into another one
       * Update the most recent expense
       * Add a new expense entry
     """
     print(Fore.CYAN + "\n📂 Expense Categories:")
-    budgets.execute("SELECT name FROM expense_categories")
-    categories = budgets.fetchall()
+    categories = store.categories('expense')
 
     if categories:
         for i, category in enumerate(categories, start=1):
-            print(f"{i}. {category[0]}")
+            print(f"{i}. {category}")
     else:
         print(Fore.LIGHTWHITE_EX + "⚠️  No categories found yet.")
 
@@ -194,7 +97,7 @@ def add_expense(budgets, connect):
     selection = input(
         Fore.LIGHTWHITE_EX + "\nEnter the number of a category,\n"
         "or type 'new' to add, 'delete' to remove one,\n"
-        "or 'update' to modify last expense: "
+        "'merge' to combine two, or 'update' to modify last expense: "
     ).strip().lower()
 
     # Option to add new category
@@ -206,54 +109,20 @@ def add_expense(budgets, connect):
             return
 
         try:
-            budgets.execute(
-                "INSERT INTO expense_categories (name) "
-                "VALUES (?)", (new_category,)
-            )
-            connect.commit()
+            store.add_category('expense', new_category)
             print(Fore.GREEN + f"✅ New category '{new_category}' added.")
-        except sqlite3.IntegrityError:
+        except DuplicateCategoryError:
             print(Fore.RED + "❌ That category already exists.")
         return
 
-    # Option to delete a category
-    elif selection == 'delete':
-        del_index = input("Enter the number of the category to " \
-                          "delete: ").strip()
-        try:
-            del_index = int(del_index)
-            if 1 <= del_index <= len(categories):
-                category = categories[del_index - 1][0]
-
-                confirm = input(
-                    Fore.RED + f"⚠️  Are you sure you want to "
-                               f"delete '{category}'? "
-                               "This cannot be undone. "
-                               "(y/n): ").strip().lower()
-                if confirm == 'y':
-                    budgets.execute(
-                        "DELETE FROM expense_categories WHERE "
-                        "name = ?", (category,)
-                    )
-                    budgets.execute(
-                        "DELETE FROM expenses WHERE category = ?", (category,)
-                    )
-                    connect.commit()
-                    print(Fore.GREEN + f"🗑️ Category '{category}' "
-                                       f"and its expenses deleted.")
-                else:
-                    print(Fore.YELLOW + "Deletion cancelled.")
-            else:
-                print(Fore.RED + "❌ Invalid category number.")
-        except ValueError:
-            print(Fore.RED + "❌ Please enter a valid number.")
+    # Option to delete or merge a category
+    elif selection in ('delete', 'merge'):
+        manage_category(store, 'expense', categories, selection)
         return
 
     # Option to update most recent expense
     elif selection == 'update':
-        budgets.execute("SELECT id, category, amount FROM expenses " \
-                        "ORDER BY date DESC LIMIT 1")
-        last = budgets.fetchone()
+        last = store.last_expense()
 
         if not last:
             print(Fore.YELLOW + "⚠️ No expense records found.")
@@ -263,9 +132,7 @@ def add_expense(budgets, connect):
                                      f"{last[1]} | R{last[2]:.2f}")
         try:
             new_amount = float(input("Enter new amount: ").strip())
-            budgets.execute("UPDATE expenses SET amount = ? "
-                            "WHERE id = ?", (new_amount, last[0]))
-            connect.commit()
+            store.update_expense(last[0], new_amount)
             print(Fore.GREEN + f"✅ Expense updated to R{new_amount:.2f}.")
         except ValueError:
             print(Fore.RED + "❌ Please enter a valid number.")
@@ -276,13 +143,13 @@ def add_expense(budgets, connect):
         try:
             index = int(selection)
             if 1 <= index <= len(categories):
-                category = categories[index - 1][0]
+                category = categories[index - 1]
             else:
                 print(Fore.RED + "❌ Invalid category number.")
                 return
         except ValueError:
             print(Fore.RED + "❌ Invalid input. Enter a number, 'new', "
-                             "'delete', or 'update'.")
+                             "'delete', 'merge', or 'update'.")
             return
 
         try:
@@ -292,25 +159,89 @@ def add_expense(budgets, connect):
             print(Fore.RED + "❌ Amount must be a valid number.")
             return
 
-        budgets.execute(
-            "INSERT INTO expenses (category, amount) VALUES (?, ?)",
-            (category, amount)
-        )
-        connect.commit()
+        store.add_record('expense', category, amount)
 
         print(Fore.GREEN + f"✅ Expense of R{amount:.2f} "
                            f"added under '{category}'.")
 
 
+def pick_category(categories, prompt):
+    """
+    Asks the user for a category number from the listed categories.
+    Returns the category name, or None if the input is invalid.
+    """
+    try:
+        index = int(input(prompt).strip())
+    except ValueError:
+        print(Fore.RED + "❌ Please enter a valid number.")
+        return None
+
+    if 1 <= index <= len(categories):
+        return categories[index - 1]
+
+    print(Fore.RED + "❌ Invalid category number.")
+    return None
+
+
+def manage_category(store, kind, categories, action):
+    """
+    - Handles the 'delete' and 'merge' options for a category.
+    - kind is 'expense' or 'income'; action is 'delete' or 'merge'.
+    - Delete removes the category together with all of its records.
+    - Merge moves all records of one category into another category
+      and then removes the old category.
+    """
+    category = pick_category(categories, f"Enter the number of the "
+                                          f"category to {action}: ")
+    if category is None:
+        return
+
+    if action == 'merge':
+        target = pick_category(categories, f"Enter the number of the "
+                                            f"category to merge "
+                                            f"'{category}' into: ")
+        if target is None:
+            return
+        if target == category:
+            print(Fore.RED + "❌ A category cannot be merged into itself.")
+            return
+        question = f"merge '{category}' into '{target}'?"
+    else:
+        question = f"delete '{category}' and all of its records?"
+
+    confirm = input(
+        Fore.RED + f"⚠️  Are you sure you want to {question} "
+                   "This cannot be undone. (y/n): ").strip().lower()
+    if confirm != 'y':
+        print(Fore.YELLOW + f"{action.title()} cancelled.")
+        return
+
+    if action == 'merge':
+        moved = store.merge_category(kind, category, target,
+                                     show_progress)
+        print(Fore.GREEN + f"🔀 Category '{category}' merged into "
+                           f"'{target}' ({moved} records moved).")
+    else:
+        removed = store.delete_category(kind, category, show_progress)
+        print(Fore.GREEN + f"🗑️ Category '{category}' and its "
+                           f"{removed} records deleted.")
+
+
+def show_progress(done, total, table, verb):
+    """
+    Prints how many records of a category have been deleted or moved.
+    """
+    print(Fore.LIGHTWHITE_EX + f"   ⏳ {done}/{total} {table} "
+                               f"records {verb}...")
+
+
 #  Menu Item 2, View Expense
-def view_expenses(budgets):
+def view_expenses(store):
     """
     Displays all expenses stored in the database.
     Shows date, category, and amount.
     """
-    budgets.execute("SELECT date, category, amount FROM expenses ORDER " \
-                    "BY date DESC")
-    records = budgets.fetchall()
+    records = store.records('expense')
 
     if not records:
         print(Fore.LIGHTWHITE_EX + "\nNo expenses recorded yet.")
@@ -323,14 +254,12 @@ def view_expenses(budgets):
 
 
     #  Menu Item 3 – View Expenses by Category
-def view_by_category(budgets):
+def view_by_category(store):
     """
     - Shows all expenses grouped by category.
     - Displays category, date, and amount in a clean format.
     """
-    budgets.execute("SELECT category, date, amount FROM expenses " \
-                    "ORDER BY category, date DESC")
-    records = budgets.fetchall()
+    records = store.records_by_category('expense')
 
     if not records:
         print(Fore.LIGHTWHITE_EX + "\n⚠ No expenses found.")
@@ -347,31 +276,38 @@ def view_by_category(budgets):
 
 
 # Menu Item 4 – Add Income
-def add_income(budgets, connect):
+def add_income(store):
     """
     - Allows the user to add a new income record.
     - Displays current income categories from the database.
     - Lets the user select one or type 'new' to add a new category.
+    - Lets the user type 'delete' or 'merge' to manage a category.
     - Prompts for the income amount.
     - Inserts the income (and category, if new) into the database.
     """
 
     print(Fore.CYAN + "\n🧾 Income Categories:")
-    budgets.execute("SELECT name FROM income_categories")
-    categories = budgets.fetchall()
+    categories = store.categories('income')
 
     if categories:
         for i, category in enumerate(categories, start=1):
-            print(f"{i}. {category[0]}")
+            print(f"{i}. {category}")
     else:
         print(Fore.LIGHTWHITE_EX + "⚠️  No categories found yet.")
 
     selection = input(
         Fore.LIGHTWHITE_EX + "\nEnter the number of a category, or "
-                             "type 'new' to add one: "
+                             "type 'new' to add one,\n"
+                             "'delete' to remove one or 'merge' to "
+                             "combine two: "
     ).strip()
 
-    if selection.lower() == 'new':
+    if selection.lower() in ('delete', 'merge'):
+        manage_category(store, 'income', categories,
+                        selection.lower())
+        return
+
+    elif selection.lower() == 'new':
         new_category = input("Enter the new income category "
                              "name: ").strip().title()
 
@@ -380,27 +316,23 @@ def add_income(budgets, connect):
             return
 
         try:
-            budgets.execute(
-                "INSERT INTO income_categories (name) VALUES "
-                "(?)", (new_category,)
-            )
-            connect.commit()
+            store.add_category('income', new_category)
             category = new_category
             print(Fore.GREEN + f"🟢 New category '{category}' added.")
-        except sqlite3.IntegrityError:
+        except DuplicateCategoryError:
             print(Fore.RED + "❌ That category already exists.")
             return
     else:
         try:
             index = int(selection)
             if 1 <= index <= len(categories):
-                category = categories[index - 1][0]
+                category = categories[index - 1]
             else:
                 print(Fore.RED + "❌ Invalid category number.")
                 return
         except ValueError:
             print(Fore.RED + "❌ Invalid input. Please enter a "
-                             "number or 'new'.")
+                             "number, 'new', 'delete' or 'merge'.")
             return
 
     try:
@@ -410,25 +342,19 @@ def add_income(budgets, connect):
         print(Fore.RED + "❌ Amount must be a valid number.")
         return
 
-    budgets.execute(
-        "INSERT INTO income (category, amount) VALUES (?, ?)",
-        (category, amount)
-    )
-    connect.commit()
+    store.add_record('income', category, amount)
 
     print(Fore.GREEN + f"Income of R{amount:.2f} "
                        f"added under '{category}'.")
 
 
 # Menu Option 5 – View Income
-def view_income(budgets):
+def view_income(store):
     """
     Displays all income entries stored in the database.
     Shows date, category, and amount.
     """
-    budgets.execute("SELECT date, category, amount FROM income " \
-                    "ORDER BY date DESC")
-    records = budgets.fetchall()
+    records = store.records('income')
 
     if not records:
         print(Fore.LIGHTYELLOW_EX + "\n⚠ No income records found.")
@@ -441,14 +367,12 @@ def view_income(budgets):
 
 
    # Menu Option 6 – View Income by Category
-def view_income_category(budgets):
+def view_income_category(store):
     """
     - Shows all income entries grouped by category.
     - Displays category, date, and amount.
     """
-    budgets.execute("SELECT category, date, amount FROM income ORDER " \
-                    "BY category, date DESC")
-    records = budgets.fetchall()
+    records = store.records_by_category('income')
 
     if not records:
         print(Fore.LIGHTWHITE_EX + "\n⚠ No income records found.")
@@ -465,7 +389,7 @@ def view_income_category(budgets):
 
 
   # Menu Option 7 – Set Budget for a Category
-def set_budget(budgets, connect):
+def set_budget(store):
     """
     - Allows the user to set a budget for an expense category.
     - Displays all current categories and lets the user select or add one.
@@ -474,12 +398,11 @@ def set_budget(budgets, connect):
     """
     print(Fore.CYAN + "\n🧾 Set Budget for a Category")
 
-    budgets.execute("SELECT name FROM expense_categories")
-    categories = budgets.fetchall()
+    categories = store.categories('expense')
 
     if categories:
         for i, category in enumerate(categories, start=1):
-            print(f"{i}. {category[0]}")
+            print(f"{i}. {category}")
     else:
         print(Fore.LIGHTWHITE_EX + "⚠️  No categories found.")
 
@@ -497,21 +420,17 @@ def set_budget(budgets, connect):
             return
 
         try:
-            budgets.execute(
-                "INSERT INTO expense_categories (name) "
-                "VALUES (?)", (new_category,)
-            )
-            connect.commit()
+            store.add_category('expense', new_category)
             category = new_category
             print(Fore.GREEN + f"✅ New category '{category}' added.")
-        except sqlite3.IntegrityError:
+        except DuplicateCategoryError:
             print(Fore.RED + "❌ That category already exists.")
             return
     else:
         try:
             index = int(selection)
             if 1 <= index <= len(categories):
-                category = categories[index - 1][0]
+                category = categories[index - 1]
             else:
                 print(Fore.RED + "❌ Invalid category number.")
                 return
@@ -527,32 +446,19 @@ def set_budget(budgets, connect):
         print(Fore.RED + "❌ Amount must be a valid number.")
         return
 
-    budgets.execute(
-        "INSERT INTO budget (category, budget_amount) VALUES (?, ?) "
-        "ON CONFLICT(category) DO UPDATE SET budget_amount = " \
-        "excluded.budget_amount",
-        (category, amount)
-    )
-    connect.commit()
+    store.set_budget(category, amount)
 
     print(Fore.GREEN + f"📌 Budget of R{amount:.2f} set "
                        f"for '{category}'.")
     
 
 # Menu Option 8 – View Budget for a Category
-def view_budget(budgets):
+def view_budget(store):
     """
     Displays the monthly budget set for each expense category.
     Also shows total spending so far in that category and remaining budget.
     """
-    budgets.execute('''
-        SELECT b.category, b.budget_amount,
-               IFNULL(SUM(e.amount), 0) AS total_spent
-        FROM budget b
-        LEFT JOIN expenses e ON b.category = e.category
-        GROUP BY b.category, b.budget_amount
-    ''')
-    rows = budgets.fetchall()
+    rows = store.budget_overview()
 
     if not rows:
         print(Fore.LIGHTWHITE_EX + "\n⚠ No budgets have been set yet.")
@@ -572,7 +478,7 @@ def view_budget(budgets):
 
 
 # Menu Option 9 – Set Financial Goals
-def set_financial_goal(budgets, connect):
+def set_financial_goal(store):
     """
     Replaces any existing goal with a new one.
     Only one active financial goal is stored.
@@ -593,26 +499,18 @@ def set_financial_goal(budgets, connect):
         print(Fore.RED + "❌ Invalid number.")
         return
 
-    budgets.execute("DELETE FROM financial_goals")
-
-    # Add new goal
-    budgets.execute('''
-        INSERT INTO financial_goals (description, target_amount, current_progress)
-        VALUES (?, ?, 0)
-    ''', (description, target))
-    connect.commit()
+    store.set_goal(description, target)
 
     print(Fore.GREEN + f"✅ Goal '{description}' set with target R{target:.2f}.")
 
 
 # Menu Option 10 – View Progress Towards Financial Goals
-def view_financial_goals(budgets, connect):
+def view_financial_goals(store):
     """
     Shows the active goal and calculates live savings progress:
     Net Savings = Total Income - Total Expenses
     """
-    budgets.execute("SELECT description, target_amount FROM financial_goals")
-    goal = budgets.fetchone()
+    goal = store.goal()
 
     if not goal:
         print(Fore.LIGHTWHITE_EX + "\n⚠ No financial goal set.")
@@ -620,11 +518,8 @@ def view_financial_goals(budgets, connect):
 
     description, target = goal
 
-    budgets.execute("SELECT IFNULL(SUM(amount), 0) FROM income")
-    total_income = budgets.fetchone()[0]
-
-    budgets.execute("SELECT IFNULL(SUM(amount), 0) FROM expenses")
-    total_expenses = budgets.fetchone()[0]
+    total_income = store.total('income')
+    total_expenses = store.total('expense')
 
     savings = total_income - total_expenses
     percent = (savings / target) * 100 if target > 0 else 0
@@ -0,0 +1,16 @@
+import pytest
+
+from budget_storage import MemoryStorage, SQLiteStorage
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def store(request, tmp_path):
+    """
+    Every test runs once against each storage backend.
+    """
+    if request.param == 'sqlite':
+        store = SQLiteStorage(str(tmp_path / 't.db'))
+    else:
+        store = MemoryStorage()
+    yield store
+    store.close()
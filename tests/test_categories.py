@@ -0,0 +1,165 @@
+import pytest
+
+import budgetsareus
+from budget_storage import SQLiteStorage
+
+
+def test_delete_category(store):
+    store.add_records('expense', [('Food', 1.0, '2025-01-01')] * 12
+                      + [('Health', 2.0, '2025-01-01')])
+    store.set_budget('Food', 100.0)
+    store.set_budget('Health', 10.0)
+    calls = []
+
+    removed = store.delete_category('expense', 'Food',
+                                    lambda *args: calls.append(args),
+                                    batch_size=5)
+
+    assert removed == 12
+    assert calls[-1] == (12, 12, 'expenses', 'deleted')
+    assert 'Food' not in store.categories('expense')
+    assert store.records('expense') == [('2025-01-01', 'Health', 2.0)]
+    assert store.budget_overview() == [('Health', 10.0, 2.0)]
+
+
+def test_delete_income_category(store):
+    store.add_records('income', [('Bonus', 50.0, '2025-01-01'),
+                                 ('Salary', 900.0, '2025-01-01')])
+
+    assert store.delete_category('income', 'Bonus') == 1
+    assert 'Bonus' not in store.categories('income')
+    assert store.total('income') == 900.0
+
+
+def test_merge_category_folds_budget(store):
+    store.add_records('expense', [('Health', 2.0, '2025-01-01')] * 3
+                      + [('Food', 10.0, '2025-01-02')])
+    store.set_budget('Food', 100.0)
+    store.set_budget('Health', 50.0)
+    calls = []
+
+    moved = store.merge_category('expense', 'Health', 'Food',
+                                 lambda *args: calls.append(args),
+                                 batch_size=2)
+
+    assert moved == 3
+    assert calls[-1] == (3, 3, 'expenses', 'moved')
+    assert 'Health' not in store.categories('expense')
+    assert {category for _, category, _ in store.records('expense')} \
+        == {'Food'}
+    assert store.budget_overview() == [('Food', 150.0, 16.0)]
+
+
+def test_merge_category_without_target_budget(store):
+    store.set_budget('Health', 50.0)
+    store.add_record('expense', 'Health', 5.0, '2025-01-01')
+
+    store.merge_category('expense', 'Health', 'Transport')
+
+    assert store.budget_overview() == [('Transport', 50.0, 5.0)]
+
+
+def test_merge_category_into_itself(store):
+    store.add_record('expense', 'Food', 10.0, '2025-01-01')
+
+    with pytest.raises(ValueError):
+        store.merge_category('expense', 'Food', 'Food')
+
+    assert 'Food' in store.categories('expense')
+    assert store.records('expense') == [('2025-01-01', 'Food', 10.0)]
+    assert store.total('expense') == 10.0
+
+
+
+
+def test_batches_report_progress(tmp_path):
+    store = SQLiteStorage(str(tmp_path / 't.db'))
+    store.add_records('expense', [('Food', 1.0, '2025-01-01')] * 12)
+    calls = []
+
+    store.delete_category('expense', 'Food',
+                          lambda *args: calls.append(args), batch_size=5)
+
+    assert calls == [(5, 12, 'expenses', 'deleted'),
+                     (10, 12, 'expenses', 'deleted'),
+                     (12, 12, 'expenses', 'deleted')]
+    store.close()
+
+
+def test_delete_unknown_category(store):
+    with pytest.raises(ValueError):
+        store.delete_category('expense', 'Nope')
+    with pytest.raises(ValueError):
+        store.delete_category('income', 'Food')
+
+
+@pytest.mark.parametrize('with_budget', [False, True])
+def test_merge_into_unknown_category(store, with_budget):
+    store.add_record('expense', 'Food', 10.0, '2025-01-01')
+    if with_budget:
+        store.set_budget('Food', 100.0)
+
+    with pytest.raises(ValueError):
+        store.merge_category('expense', 'Food', 'Nope')
+    with pytest.raises(ValueError):
+        store.merge_category('expense', 'Nope', 'Food')
+
+    # A later write must not commit half of the failed merge
+    store.add_record('expense', 'Health', 1.0, '2025-01-02')
+    assert 'Food' in store.categories('expense')
+    assert store.records_by_category('expense') == [
+        ('Food', '2025-01-01', 10.0),
+        ('Health', '2025-01-02', 1.0),
+    ]
+    expected = [('Food', 100.0, 10.0)] if with_budget else []
+    assert store.budget_overview() == expected
+
+
+def answer(monkeypatch, *answers):
+    """
+    Makes input() return the given answers one after another.
+    """
+    replies = iter(answers)
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(replies))
+
+
+def test_manage_category_rejects_self_merge(store, monkeypatch):
+    store.add_record('expense', 'Food', 10.0, '2025-01-01')
+    categories = store.categories('expense')
+    answer(monkeypatch, '1', '1')
+
+    budgetsareus.manage_category(store, 'expense', categories, 'merge')
+
+    assert store.categories('expense') == categories
+    assert store.records('expense') == [('2025-01-01', 'Food', 10.0)]
+
+
+def test_manage_category_cancelled(store, monkeypatch):
+    store.add_record('expense', 'Food', 10.0, '2025-01-01')
+    categories = store.categories('expense')
+    answer(monkeypatch, '1', 'n')
+
+    budgetsareus.manage_category(store, 'expense', categories, 'delete')
+
+    assert store.categories('expense') == categories
+    assert store.total('expense') == 10.0
+
+
+def test_manage_category_invalid_number(store, monkeypatch):
+    categories = store.categories('income')
+    answer(monkeypatch, '99')
+
+    budgetsareus.manage_category(store, 'income', categories, 'delete')
+
+    assert store.categories('income') == categories
+
+
+def test_manage_category_merge(store, monkeypatch):
+    store.add_record('income', 'Bonus', 50.0, '2025-01-01')
+    categories = store.categories('income')
+    answer(monkeypatch, '4', '1', 'y')
+
+    budgetsareus.manage_category(store, 'income', categories, 'merge')
+
+    assert 'Bonus' not in store.categories('income')
+    assert store.records('income') == [('2025-01-01', 'Salary', 50.0)]
@@ -0,0 +1,174 @@
+import pytest
+
+from budget_storage import (DEFAULT_CATEGORIES, DuplicateCategoryError,
+                            Storage, simulate_months)
+
+
+def test_storage_is_abstract():
+    class Incomplete(Storage):
+        def categories(self, kind):
+            return []
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_default_categories(store):
+    assert store.categories('expense') == DEFAULT_CATEGORIES['expense']
+    assert store.categories('income') == DEFAULT_CATEGORIES['income']
+
+
+def test_add_category(store):
+    store.add_category('expense', 'Rent')
+    assert store.categories('expense')[-1] == 'Rent'
+    assert 'Rent' not in store.categories('income')
+
+    with pytest.raises(DuplicateCategoryError):
+        store.add_category('expense', 'Rent')
+
+
+def test_records_ordering(store):
+    store.add_record('expense', 'Health', 5.0, '2025-01-01')
+    store.add_record('expense', 'Food', 10.0, '2025-02-01')
+    store.add_record('expense', 'Food', 20.0, '2025-01-01')
+    store.add_record('expense', 'Health', 7.0, '2025-01-01')
+
+    assert store.records('expense') == [
+        ('2025-02-01', 'Food', 10.0),
+        ('2025-01-01', 'Health', 5.0),
+        ('2025-01-01', 'Food', 20.0),
+        ('2025-01-01', 'Health', 7.0),
+    ]
+    assert store.records_by_category('expense') == [
+        ('Food', '2025-02-01', 10.0),
+        ('Food', '2025-01-01', 20.0),
+        ('Health', '2025-01-01', 5.0),
+        ('Health', '2025-01-01', 7.0),
+    ]
+    assert store.records('income') == []
+
+
+def test_add_record_defaults_to_today(store):
+    store.add_record('income', 'Salary', 100.0)
+    date, category, amount = store.records('income')[0]
+    assert len(date) == 10
+    assert (category, amount) == ('Salary', 100.0)
+
+
+def test_add_records_unknown_category_adds_nothing(store):
+    with pytest.raises(ValueError):
+        store.add_records('expense', [('Health', 1.0, '2025-01-01'),
+                                      ('Nope', 1.0, '2025-01-01')])
+    assert store.records('expense') == []
+
+    with pytest.raises(ValueError):
+        store.add_record('income', 'Food', 1.0)
+
+
+def test_last_and_update_expense(store):
+    assert store.last_expense() is None
+
+    store.add_record('expense', 'Food', 10.0, '2025-03-01')
+    store.add_record('expense', 'Health', 4.0, '2025-01-01')
+    last_id, category, amount = store.last_expense()
+    assert (category, amount) == ('Food', 10.0)
+
+    store.update_expense(last_id, 12.5)
+    assert store.last_expense() == (last_id, 'Food', 12.5)
+    assert store.total('expense') == 16.5
+
+
+def test_budget_overview(store):
+    assert store.budget_overview() == []
+
+    store.set_budget('Food', 100)
+    store.set_budget('Health', 50.0)
+    store.set_budget('Food', 80.0)
+    store.add_record('expense', 'Food', 30.0, '2025-01-01')
+    store.add_record('expense', 'Food', 25.0, '2025-01-02')
+
+    assert store.budget_overview() == [
+        ('Food', 80.0, 55.0),
+        ('Health', 50.0, 0.0),
+    ]
+
+
+def test_set_budget_unknown_category(store):
+    with pytest.raises(ValueError):
+        store.set_budget('Nope', 10.0)
+    assert store.budget_overview() == []
+
+
+def test_goal_and_totals(store):
+    assert store.goal() is None
+    assert store.total('income') == 0
+    assert store.total('expense') == 0
+
+    store.set_goal('Car', 5000)
+    store.set_goal('Holiday', 3000.0)
+    store.add_record('income', 'Salary', 1000.0, '2025-01-01')
+    store.add_record('income', 'Bonus', 250.0, '2025-01-01')
+    store.add_record('expense', 'Food', 400.0, '2025-01-01')
+
+    assert store.goal() == ('Holiday', 3000.0)
+    assert store.total('income') == 1250.0
+    assert store.total('expense') == 400.0
+
+
+def test_simulate_months(store):
+    store.set_budget('Health', 40.0)
+    store.add_record('income', 'Salary', 500.0, '2024-12-01')
+
+    results = simulate_months(store, 14, {'Salary': 1000.0},
+                              {'Food': 300.0, 'Health': 20.0},
+                              budgets={'Food': 250.0}, start='2024-12')
+
+    assert len(results) == 14
+    assert results[0] == ('2024-12', 1180.0, ['Food'])
+    assert results[1][0] == '2025-01'
+    assert results[-1] == ('2026-01', 500.0 + 14 * 680.0, ['Food'])
+    assert results[0][2] is not results[1][2]
+    assert store.budget_overview() == [('Food', 250.0, 14 * 300.0),
+                                       ('Health', 40.0, 14 * 20.0)]
+
+
+@pytest.mark.parametrize('call', [
+    lambda store: store.add_record('expense', 'Nope', 1.0),
+    lambda store: store.add_records('income', [('Nope', 1.0, None)]),
+    lambda store: store.set_budget('Nope', 10.0),
+    lambda store: store.delete_category('expense', 'Nope'),
+    lambda store: store.delete_category('income', 'Food'),
+    lambda store: store.merge_category('expense', 'Nope', 'Food'),
+    lambda store: store.merge_category('expense', 'Food', 'Nope'),
+    lambda store: store.add_category('savings', 'Rainy Day'),
+    lambda store: store.categories('savings'),
+    lambda store: store.records('savings'),
+    lambda store: store.total('savings'),
+    lambda store: store.delete_category('savings', 'Food'),
+    lambda store: store.merge_category('savings', 'Food', 'Health'),
+])
+def test_unknown_kind_or_category(store, call):
+    store.add_record('expense', 'Food', 10.0, '2025-01-01')
+    store.set_budget('Food', 100.0)
+
+    with pytest.raises(ValueError):
+        call(store)
+
+    assert store.categories('expense') == DEFAULT_CATEGORIES['expense']
+    assert store.categories('income') == DEFAULT_CATEGORIES['income']
+    assert store.records('expense') == [('2025-01-01', 'Food', 10.0)]
+    assert store.records('income') == []
+    assert store.budget_overview() == [('Food', 100.0, 10.0)]
+
+
+def test_totals_stay_exact_after_updates(store):
+    store.add_records('expense', [('Food', 0.1, '2025-01-01')] * 1000)
+    expense_id = store.last_expense()[0]
+    for step in range(1, 1001):
+        store.update_expense(expense_id, step / 10)
+
+    expected = 999 * 0.1 + 100.0
+    assert store.total('expense') == pytest.approx(expected)
+    assert store.budget_overview() == []
+    store.set_budget('Food', 1.0)
+    assert store.budget_overview()[0][2] == pytest.approx(expected)